@@ -1,30 +1,315 @@
 import asyncio
-import json
+import concurrent.futures
+import hashlib
+import math
 import os
-from contextlib import AsyncExitStack
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Set, Tuple
 
+import orjson
 from dotenv import load_dotenv
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from openai import AsyncAzureOpenAI
+from mcp.types import (
+    CallToolResult,
+    ListToolsResult,
+    ServerNotification,
+    Tool,
+    ToolListChangedNotification,
+)
+from openai import AsyncAzureOpenAI, DefaultAsyncHttpxClient
+
+try:
+    import uvloop
+except ImportError:  # uvloop does not support Windows
+    uvloop = None
 
 # Load environment variables
 load_dotenv(".env")
 
+# Seconds to reuse a tool's result for identical arguments; tools not listed are never cached
+TOOL_RESULT_TTLS: Dict[str, float] = {
+    "draw_ascii_rabbit": math.inf,
+    "read_notes": 0,
+}
+
+# Server tool that runs several tool calls in a single request
+BATCH_TOOL = "batch_execute"
+
+# Tool output longer than this is truncated before it is sent back to the model
+MAX_TOOL_CONTENT_CHARS = 8000
+
+# HTTP connection pool and Azure OpenAI clients shared by every MCPAzureOpenAIClient
+_shared_http_client: Optional[DefaultAsyncHttpxClient] = None
+_openai_clients: Dict[Tuple[str, str, str], AsyncAzureOpenAI] = {}
+
+
+def _get_openai_client(api_key: str, endpoint: str, api_version: str) -> AsyncAzureOpenAI:
+    """Get a shared Azure OpenAI client for the given configuration.
+
+    All clients reuse one HTTP connection pool, so TLS connections stay open
+    across chat completions and client instances.
+
+    Args:
+        api_key: The Azure OpenAI API key.
+        endpoint: The Azure OpenAI endpoint.
+        api_version: The Azure OpenAI API version.
+
+    Returns:
+        The Azure OpenAI client.
+    """
+    global _shared_http_client
+
+    key = (endpoint, api_version, api_key)
+    client = _openai_clients.get(key)
+    if client is None:
+        if _shared_http_client is None:
+            _shared_http_client = DefaultAsyncHttpxClient()
+        client = AsyncAzureOpenAI(
+            api_key=api_key,
+            azure_endpoint=endpoint,
+            api_version=api_version,
+            http_client=_shared_http_client,
+        )
+        _openai_clients[key] = client
+    return client
+
+
+async def close_shared_clients():
+    """Close the shared Azure OpenAI clients and their connection pool."""
+    global _shared_http_client
+
+    _openai_clients.clear()
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
+
+
+class AsyncLoopThread(threading.Thread):
+    """Thread that runs an asyncio event loop in the background."""
+
+    def __init__(self):
+        """Initialize the thread and its event loop."""
+        super().__init__(daemon=True)
+        # Prefer uvloop's libuv-based loop when it is installed
+        self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+
+    def run(self):
+        """Run the event loop until it is stopped."""
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the event loop from another thread.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            A future holding the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        """Stop the event loop, wait for the thread to exit and close the loop."""
+        self.submit(self.loop.shutdown_asyncgens()).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.join()
+        self.loop.close()
+
+
+class MCPHost:
+    """Host for sessions to one or more MCP servers.
+
+    Each server's connection lives in its own task, since the stdio
+    transport must be closed in the task that opened it. Tool calls are
+    routed to whichever server registered the tool.
+    """
+
+    def __init__(self, on_tools_changed: Optional[Callable[[], None]] = None):
+        """Initialize the host.
+
+        Args:
+            on_tools_changed: Called when a server reports that its tool list has changed.
+        """
+        self.sessions: Dict[str, ClientSession] = {}
+        # Tool name -> (server name, tool); the first server to register a name wins
+        self.tool_registry: Dict[str, Tuple[str, Tool]] = {}
+        self._on_tools_changed = on_tools_changed
+        self._stale_servers: Set[str] = set()
+        self._stop = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+    async def connect(self, name: str, params: StdioServerParameters) -> ListToolsResult:
+        """Connect to an MCP server and register its tools.
+
+        Args:
+            name: Name to register the server under.
+            params: How to start the server.
+
+        Returns:
+            The server's tool listing.
+        """
+        ready = asyncio.get_running_loop().create_future()
+        self._tasks.append(asyncio.create_task(self._run_server(name, params, ready)))
+        return await ready
+
+    async def connect_all(
+        self, servers: Dict[str, StdioServerParameters]
+    ) -> Dict[str, ListToolsResult]:
+        """Connect to several MCP servers concurrently.
+
+        Args:
+            servers: Server names mapped to how to start each server.
+
+        Returns:
+            Each server's tool listing, keyed by server name.
+        """
+        results = await asyncio.gather(
+            *(self.connect(name, params) for name, params in servers.items())
+        )
+        return dict(zip(servers, results))
+
+    async def _run_server(
+        self, name: str, params: StdioServerParameters, ready: asyncio.Future
+    ):
+        """Hold a server connection open until the host is closed.
+
+        Args:
+            name: Name to register the server under.
+            params: How to start the server.
+            ready: Resolved with the server's tool listing once connected, or with the connection error.
+        """
+        try:
+            async with stdio_client(params) as (read, write):
+                async with ClientSession(
+                    read,
+                    write,
+                    message_handler=lambda message: self._handle_message(name, message),
+                ) as session:
+                    await session.initialize()
+                    tools_result = await session.list_tools()
+                    self.sessions[name] = session
+                    self._register_tools(name, tools_result)
+                    ready.set_result(tools_result)
+                    await self._stop.wait()
+        except Exception as e:
+            if ready.done():
+                raise
+            ready.set_exception(e)
+        finally:
+            # Stop routing to this server once its connection is gone
+            self.sessions.pop(name, None)
+            self._stale_servers.discard(name)
+            self._unregister_tools(name)
+
+    async def _handle_message(self, name: str, message: Any) -> None:
+        """Handle incoming server messages.
+
+        Args:
+            name: The server that sent the message.
+            message: A server request, notification or exception.
+        """
+        # Mark the server's tools for refresh when it reports they have changed
+        if isinstance(message, ServerNotification) and isinstance(
+            message.root, ToolListChangedNotification
+        ):
+            self._stale_servers.add(name)
+            if self._on_tools_changed:
+                self._on_tools_changed()
+
+    def _unregister_tools(self, name: str):
+        """Remove a server's entries from the tool registry.
+
+        Args:
+            name: The server name.
+        """
+        for tool_name, (server_name, _) in list(self.tool_registry.items()):
+            if server_name == name:
+                del self.tool_registry[tool_name]
+
+    def _register_tools(self, name: str, tools_result: ListToolsResult):
+        """Replace a server's entries in the tool registry.
+
+        Args:
+            name: The server name.
+            tools_result: The server's tool listing.
+        """
+        self._unregister_tools(name)
+        for tool in tools_result.tools:
+            self.tool_registry.setdefault(tool.name, (name, tool))
+
+    async def refresh_tools(self):
+        """Fetch tool listings again from servers whose tools have changed."""
+        for name in list(self._stale_servers):
+            self._stale_servers.discard(name)
+            session = self.sessions.get(name)
+            # Skip servers whose connection has closed
+            if session is not None:
+                self._register_tools(name, await session.list_tools())
+
+    def get_all_tools(self) -> List[Tool]:
+        """Get the tools registered by all servers.
+
+        Returns:
+            The registered tools.
+        """
+        return [tool for _, tool in self.tool_registry.values()]
+
+    def server_for(self, tool_name: str) -> Optional[str]:
+        """Get the server that registered a tool.
+
+        Args:
+            tool_name: The tool name.
+
+        Returns:
+            The server name, or None if no server offers the tool.
+        """
+        entry = self.tool_registry.get(tool_name)
+        return entry[0] if entry else None
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> CallToolResult:
+        """Call a tool on the server that registered it.
+
+        Args:
+            name: The tool name.
+            arguments: The tool arguments.
+
+        Returns:
+            The tool call result.
+        """
+        server_name = self.server_for(name)
+        if server_name is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return await self.sessions[server_name].call_tool(name, arguments=arguments)
+
+    async def close(self):
+        """Close every server connection."""
+        self._stop.set()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
 
 class MCPAzureOpenAIClient:
     """Client for interacting with Azure OpenAI models using MCP tools."""
 
-    def __init__(self, deployment_name: str = None):
+    def __init__(
+        self,
+        deployment_name: str = None,
+        max_concurrent_tools: Optional[int] = None,
+    ):
         """Initialize the Azure OpenAI MCP client.
 
         Args:
             deployment_name: The Azure OpenAI deployment name. If not provided, will use environment variable.
+            max_concurrent_tools: Maximum number of MCP tool calls in flight at once. If not provided, will use the MCP_MAX_INFLIGHT environment variable, or 8.
+
+        Raises:
+            ValueError: If the tool call limit is less than 1.
         """
-        # Initialize session and client objects
-        self.session: Optional[ClientSession] = None
-        self.exit_stack = AsyncExitStack()
+        # Initialize MCP host and client objects
+        self.host = MCPHost(on_tools_changed=self._invalidate_tools)
         
         # Azure OpenAI configuration
         api_key = os.getenv("AZURE_OPENAI_API_KEY")
@@ -38,14 +323,44 @@ class MCPAzureOpenAIClient:
                 "AZURE_OPENAI_ENDPOINT, and AZURE_OPENAI_DEPLOYMENT_NAME in your .env file."
             )
         
-        self.openai_client = AsyncAzureOpenAI(
-            api_key=api_key,
-            azure_endpoint=endpoint,
-            api_version=api_version,
-        )
-        
-        self.stdio: Optional[Any] = None
-        self.write: Optional[Any] = None
+        self.openai_client = _get_openai_client(api_key, endpoint, api_version)
+
+        # Limit how many tool calls are in flight at once
+        if max_concurrent_tools is None:
+            max_concurrent_tools = int(os.getenv("MCP_MAX_INFLIGHT", "8"))
+        if max_concurrent_tools < 1:
+            raise ValueError(
+                f"The tool call limit must be at least 1, got {max_concurrent_tools}. "
+                "Please check max_concurrent_tools or MCP_MAX_INFLIGHT."
+            )
+        self.max_concurrent_tools = max_concurrent_tools
+        self._tool_semaphore = asyncio.Semaphore(max_concurrent_tools)
+
+        # OpenAI-format tool list, built once per connection
+        self._openai_tools: Optional[Tuple[Dict[str, Any], ...]] = None
+        # Serializes rebuilding the tool list between queries and warm-ups
+        self._tools_lock = asyncio.Lock()
+
+        # Whether a request to Azure OpenAI has succeeded; until then, warm_up retries
+        self._openai_connected = False
+
+        # Cached tool results keyed by tool name and arguments, as (timestamp, result)
+        self._call_cache: Dict[str, Tuple[float, Any]] = {}
+
+    async def connect_to_servers(self, servers: Dict[str, StdioServerParameters]):
+        """Connect to several MCP servers concurrently.
+
+        Args:
+            servers: Server names mapped to how to start each server.
+        """
+        results = await self.host.connect_all(servers)
+
+        for name, tools_result in results.items():
+            print(f"\nConnected to server '{name}' with tools:")
+            for tool in tools_result.tools:
+                print(f"  - {tool.name}: {tool.description}")
+
+        self._openai_tools = self._to_openai_tools(self.host.get_all_tools())
 
     async def connect_to_server(self, server_script_path: str = "main.py"):
         """Connect to an MCP server.
@@ -58,32 +373,24 @@ class MCPAzureOpenAIClient:
             command="python",
             args=[server_script_path],
         )
+        name = os.path.splitext(os.path.basename(server_script_path))[0]
+        await self.connect_to_servers({name: server_params})
 
-        # Connect to the server
-        stdio_transport = await self.exit_stack.enter_async_context(
-            stdio_client(server_params)
-        )
-        self.stdio, self.write = stdio_transport
-        self.session = await self.exit_stack.enter_async_context(
-            ClientSession(self.stdio, self.write)
-        )
+    def _invalidate_tools(self):
+        """Drop the OpenAI-format tool list so it is rebuilt on next use."""
+        self._openai_tools = None
 
-        # Initialize the connection
-        await self.session.initialize()        # List available tools
-        tools_result = await self.session.list_tools()
-        
-        print("\nConnected to server with tools:")
-        for tool in tools_result.tools:
-            print(f"  - {tool.name}: {tool.description}")
-    
-    async def get_mcp_tools(self) -> List[Dict[str, Any]]:
-        """Get available tools from the MCP server in OpenAI format.
+    @staticmethod
+    def _to_openai_tools(tools: List[Tool]) -> Tuple[Dict[str, Any], ...]:
+        """Convert MCP tools to OpenAI format.
+
+        Args:
+            tools: The MCP tools.
 
         Returns:
-            A list of tools in OpenAI format.
+            The tools in OpenAI format.
         """
-        tools_result = await self.session.list_tools()
-        return [
+        return tuple(
             {
                 "type": "function",
                 "function": {
@@ -92,14 +399,300 @@ class MCPAzureOpenAIClient:
                     "parameters": tool.inputSchema,
                 },
             }
-            for tool in tools_result.tools
-        ]
+            for tool in tools
+        )
+
+    async def get_mcp_tools(self) -> Tuple[Dict[str, Any], ...]:
+        """Get available tools from the MCP servers in OpenAI format.
+
+        The list is built when connecting and only rebuilt after a server
+        sends a tool list changed notification.
+
+        Returns:
+            The tools in OpenAI format.
+        """
+        async with self._tools_lock:
+            if self._openai_tools is None:
+                await self.host.refresh_tools()
+                self._openai_tools = self._to_openai_tools(self.host.get_all_tools())
+            return self._openai_tools
     
-    async def process_query(self, query: str) -> str:
+    def _result_cache_key(self, name: str, arguments: Dict[str, Any]) -> str:
+        """Build the result cache key for a tool call.
+
+        Args:
+            name: The tool name.
+            arguments: The parsed tool arguments.
+
+        Returns:
+            A hash of the tool name and canonical JSON arguments.
+        """
+        canonical = orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(
+            name.encode() + b"|" + canonical, digest_size=16
+        ).hexdigest()
+
+    def _get_cached_result(self, name: str, arguments: Dict[str, Any]) -> Optional[str]:
+        """Get a cached tool result, if the tool is cacheable and its TTL has not expired.
+
+        Args:
+            name: The tool name.
+            arguments: The parsed tool arguments.
+
+        Returns:
+            The cached tool content, or None.
+        """
+        ttl = TOOL_RESULT_TTLS.get(name, 0)
+        if ttl <= 0:
+            return None
+        cached = self._call_cache.get(self._result_cache_key(name, arguments))
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        return None
+
+    def _cache_result(self, name: str, arguments: Dict[str, Any], content: str):
+        """Cache a successful tool result if the tool is cacheable.
+
+        Args:
+            name: The tool name.
+            arguments: The parsed tool arguments.
+            content: The tool content.
+        """
+        if TOOL_RESULT_TTLS.get(name, 0) > 0:
+            key = self._result_cache_key(name, arguments)
+            self._call_cache[key] = (time.monotonic(), content)
+
+    @staticmethod
+    def _tool_result_text(result: Any) -> str:
+        """Extract the text content of a tool call result.
+
+        Args:
+            result: The tool call result.
+
+        Returns:
+            The tool content as a string.
+        """
+        if result.content:
+            if isinstance(result.content, list) and len(result.content) > 0:
+                return str(result.content[0].text)
+            return str(result.content)
+        return ""
+
+    async def _call_tool(self, name: str, arguments: Dict[str, Any]) -> str:
+        """Call an MCP tool, bounded by the client's concurrency limit.
+
+        Args:
+            name: The tool name.
+            arguments: The parsed tool arguments.
+
+        Returns:
+            The tool content.
+        """
+        async with self._tool_semaphore:
+            result = await self.host.call_tool(name, arguments)
+
+        content = self._tool_result_text(result)
+        if not result.isError:
+            self._cache_result(name, arguments, content)
+        return content
+
+    async def _call_tools_batched(
+        self, calls: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[str]:
+        """Run several tool calls through the server's batch tool in one request.
+
+        Args:
+            calls: The tool names and parsed arguments.
+
+        Returns:
+            The tool contents, in the same order as ``calls``.
+        """
+        async with self._tool_semaphore:
+            result = await self.host.call_tool(
+                BATCH_TOOL,
+                {
+                    "calls": [
+                        {"name": name, "arguments": arguments}
+                        for name, arguments in calls
+                    ],
+                    # Bound the server-side fan-out by the same limit
+                    "max_concurrent": self.max_concurrent_tools,
+                },
+            )
+
+        content = self._tool_result_text(result)
+        if result.isError:
+            return [content] * len(calls)
+
+        entries = orjson.loads(content)
+        for (name, arguments), entry in zip(calls, entries):
+            if not entry["isError"]:
+                self._cache_result(name, arguments, entry["content"])
+        return [entry["content"] for entry in entries]
+
+    async def _execute_tool_calls(
+        self, calls: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[str]:
+        """Execute tool calls, reusing cached results where possible.
+
+        Results of tools listed in ``TOOL_RESULT_TTLS`` are reused for
+        identical arguments until their TTL expires. When several calls remain
+        and are all on the server that offers ``batch_execute``, they are sent
+        in one request; otherwise they run concurrently. A failed call becomes
+        an error message in its result rather than failing the whole turn.
+
+        Args:
+            calls: The tool names and parsed arguments.
+
+        Returns:
+            The tool contents, in the same order as ``calls``.
+        """
+        contents = [self._get_cached_result(name, arguments) for name, arguments in calls]
+        pending = [i for i, content in enumerate(contents) if content is None]
+
+        batch_server = self.host.server_for(BATCH_TOOL)
+        if (
+            len(pending) > 1
+            and batch_server is not None
+            and all(
+                calls[i][0] != BATCH_TOOL and self.host.server_for(calls[i][0]) == batch_server
+                for i in pending
+            )
+        ):
+            try:
+                results = await self._call_tools_batched([calls[i] for i in pending])
+            except Exception as e:
+                results = [e] * len(pending)
+        else:
+            # gather preserves the original order
+            results = await asyncio.gather(
+                *(self._call_tool(*calls[i]) for i in pending), return_exceptions=True
+            )
+
+        for i, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                result = f"Error executing tool {calls[i][0]}: {result}"
+            contents[i] = result
+        return contents
+
+    @staticmethod
+    def _truncate_tool_content(name: str, arguments: Dict[str, Any], content: str) -> str:
+        """Shorten tool output that is too long to send back to the model.
+
+        The note says how much was left out and, for note tools, which
+        ``read_notes_range`` call returns the rest.
+
+        Args:
+            name: The tool name.
+            arguments: The parsed tool arguments.
+            content: The tool content.
+
+        Returns:
+            The content, cut to ``MAX_TOOL_CONTENT_CHARS`` with a note if it was longer.
+        """
+        if len(content) <= MAX_TOOL_CONTENT_CHARS:
+            return content
+
+        if name == "read_notes_range":
+            # Keep whole notes only, then point at the first note that was left out
+            cut = content.rfind("\n", 0, MAX_TOOL_CONTENT_CHARS)
+            try:
+                start = int(arguments.get("start"))
+            except (TypeError, ValueError):
+                start = -1
+            if cut > 0 and start >= 0:
+                next_start = start + content.count("\n", 0, cut) + 1
+                return (
+                    f"{content[:cut]}\n[truncated; call read_notes_range with "
+                    f"start={next_start} and end={arguments.get('end')} for the remaining notes]"
+                )
+        elif name == "read_notes":
+            omitted = len(content) - MAX_TOOL_CONTENT_CHARS
+            return (
+                f"{content[:MAX_TOOL_CONTENT_CHARS]}\n[truncated {omitted} more characters; "
+                "call read_notes_range with start and end indexes to page through the notes]"
+            )
+
+        omitted = len(content) - MAX_TOOL_CONTENT_CHARS
+        return (
+            f"{content[:MAX_TOOL_CONTENT_CHARS]}\n[truncated {omitted} more characters; "
+            "call the tool with narrower arguments to see the rest]"
+        )
+
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Tuple[Dict[str, Any], ...],
+        tool_choice: str,
+        on_token: Optional[Callable[[str], None]] = None,
+    ) -> Dict[str, Any]:
+        """Stream a chat completion and rebuild the assistant message from its chunks.
+
+        Args:
+            messages: The conversation so far.
+            tools: The tools in OpenAI format.
+            tool_choice: The tool choice mode.
+            on_token: Called with each piece of content as it arrives.
+
+        Returns:
+            The assistant message, with ``tool_calls`` only if the model made any.
+        """
+        stream = await self.openai_client.chat.completions.create(
+            model=self.deployment_name,  # Use deployment name instead of model for Azure
+            messages=messages,
+            tools=tools,
+            tool_choice=tool_choice,
+            stream=True,
+        )
+        self._openai_connected = True
+
+        content_parts = []
+        tool_calls: Dict[int, Dict[str, Any]] = {}
+        async for chunk in stream:
+            # Azure may send chunks without choices, e.g. for content filter results
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+
+            if delta.content:
+                content_parts.append(delta.content)
+                if on_token:
+                    on_token(delta.content)
+
+            # Tool call names and arguments arrive in fragments, keyed by index
+            for tc in delta.tool_calls or []:
+                tool_call = tool_calls.setdefault(
+                    tc.index,
+                    {"id": "", "type": "function", "function": {"name": "", "arguments": ""}},
+                )
+                if tc.id:
+                    tool_call["id"] = tc.id
+                if tc.type:
+                    tool_call["type"] = tc.type
+                if tc.function:
+                    if tc.function.name:
+                        tool_call["function"]["name"] += tc.function.name
+                    if tc.function.arguments:
+                        tool_call["function"]["arguments"] += tc.function.arguments
+
+        # Ensure content is always a string (Azure OpenAI requirement)
+        assistant_msg = {"role": "assistant", "content": "".join(content_parts)}
+        # Only add tool_calls if the model made any
+        if tool_calls:
+            assistant_msg["tool_calls"] = [tool_calls[i] for i in sorted(tool_calls)]
+        return assistant_msg
+
+    async def process_query(
+        self, query: str, on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
         """Process a query using Azure OpenAI and available MCP tools.
 
+        Responses are streamed, so content can be shown as it is generated and
+        tool calls are dispatched as soon as the model finishes making them.
+
         Args:
             query: The user query.
+            on_token: Called with each piece of response content as it arrives.
 
         Returns:
             The response from Azure OpenAI.
@@ -107,13 +700,13 @@ class MCPAzureOpenAIClient:
         # Get available tools
         tools = await self.get_mcp_tools()
 
+        # Initialize conversation with user query
+        messages = [{"role": "user", "content": query}]
+
         try:
             # Initial Azure OpenAI API call
-            response = await self.openai_client.chat.completions.create(
-                model=self.deployment_name,  # Use deployment name instead of model for Azure
-                messages=[{"role": "user", "content": query}],
-                tools=tools,
-                tool_choice="auto",
+            assistant_msg = await self._stream_completion(
+                messages, tools, "auto", on_token
             )
         except Exception as e:
             print(f"Error calling Azure OpenAI: {e}")
@@ -122,95 +715,118 @@ class MCPAzureOpenAIClient:
             print("- AZURE_OPENAI_ENDPOINT should be: https://your-resource-name.openai.azure.com/")
             print("- AZURE_OPENAI_DEPLOYMENT_NAME should match your model deployment name in Azure")
             print("- Make sure your deployment is active and the model is deployed")
-            raise        # Get assistant's response
-        assistant_message = response.choices[0].message
+            raise
 
-        # Initialize conversation with user query and assistant response
-        assistant_msg = {
-            "role": "assistant",
-        }
-        
-        # Ensure content is always a string (Azure OpenAI requirement)
-        if assistant_message.content:
-            assistant_msg["content"] = assistant_message.content
-        else:
-            assistant_msg["content"] = ""
-        
-        # Only add tool_calls if they exist and are not None
-        if assistant_message.tool_calls:
-            assistant_msg["tool_calls"] = [
-                {
-                    "id": tc.id,
-                    "type": tc.type,
-                    "function": {
-                        "name": tc.function.name,
-                        "arguments": tc.function.arguments
-                    }
-                }
-                for tc in assistant_message.tool_calls
-            ]
-            
-        messages = [
-            {"role": "user", "content": query},
-            assistant_msg
-        ]
+        # Add assistant response to conversation
+        messages.append(assistant_msg)
 
         # Handle tool calls if present
-        if assistant_message.tool_calls:
-            # Process each tool call
-            for tool_call in assistant_message.tool_calls:
-                # Execute tool call
-                result = await self.session.call_tool(
-                    tool_call.function.name,
-                    arguments=json.loads(tool_call.function.arguments),
-                )                # Add tool response to conversation
-                tool_content = ""
-                if result.content:
-                    if isinstance(result.content, list) and len(result.content) > 0:
-                        tool_content = str(result.content[0].text)
-                    else:
-                        tool_content = str(result.content)
-                
+        if "tool_calls" in assistant_msg:
+            # Parse each call's arguments; a call with malformed arguments gets an
+            # error result and is not dispatched, while the other calls still run
+            tool_calls = []
+            tool_contents: List[Optional[str]] = []
+            for tool_call in assistant_msg["tool_calls"]:
+                name = tool_call["function"]["name"]
+                try:
+                    arguments = orjson.loads(tool_call["function"]["arguments"] or "{}")
+                    if not isinstance(arguments, dict):
+                        raise ValueError("arguments must be a JSON object")
+                except ValueError as e:
+                    tool_calls.append((tool_call, {}))
+                    tool_contents.append(f"Error executing tool {name}: invalid arguments: {e}")
+                else:
+                    tool_calls.append((tool_call, arguments))
+                    tool_contents.append(None)
+
+            pending = [i for i, content in enumerate(tool_contents) if content is None]
+            results = await self._execute_tool_calls(
+                [
+                    (tool_calls[i][0]["function"]["name"], tool_calls[i][1])
+                    for i in pending
+                ]
+            )
+            for i, content in zip(pending, results):
+                tool_contents[i] = content
+
+            for (tool_call, arguments), tool_content in zip(tool_calls, tool_contents):
+                # Add tool response to conversation
                 messages.append(
                     {
                         "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "content": tool_content,
+                        "tool_call_id": tool_call["id"],
+                        "content": self._truncate_tool_content(
+                            tool_call["function"]["name"], arguments, tool_content
+                        ),
                     }
                 )
 
             # Get final response from Azure OpenAI with tool results
-            final_response = await self.openai_client.chat.completions.create(
-                model=self.deployment_name,  # Use deployment name instead of model for Azure
-                messages=messages,
-                tools=tools,
-                tool_choice="none",  # Don't allow more tool calls
+            final_msg = await self._stream_completion(
+                messages,
+                tools,
+                "none",  # Don't allow more tool calls
+                on_token,
             )
 
-            return final_response.choices[0].message.content
+            return final_msg["content"]
 
         # No tool calls, just return the direct response
-        return assistant_message.content
+        return assistant_msg["content"]
+
+    async def warm_up(self):
+        """Prepare for the next query, e.g. while waiting for user input.
+
+        Fetches the tool list again if a server reported changes and, before
+        the first query only, opens a connection to Azure OpenAI. After that
+        the shared connection pool keeps connections from earlier queries.
+        Errors are ignored here; the next query will report them.
+        """
+        try:
+            await self.get_mcp_tools()
+            if not self._openai_connected:
+                await self.openai_client.models.list()
+                self._openai_connected = True
+        except Exception:
+            pass
 
     async def cleanup(self):
         """Clean up resources."""
-        await self.exit_stack.aclose()
+        await self.host.close()
+
 
 
+def interactive_azure_openai():
+    """Interactive Azure OpenAI client with MCP tools.
 
-async def interactive_azure_openai():
-    """Interactive Azure OpenAI client with MCP tools."""
-    client = MCPAzureOpenAIClient()
+    MCP and Azure OpenAI I/O runs on a background event loop, so waiting for
+    user input on the main thread never blocks it and the client can warm up
+    for the next query while the user types.
+    """
+    loop_thread = AsyncLoopThread()
+    loop_thread.start()
+    client = None
+    warming = None
+    query = None
     try:
-        await client.connect_to_server("main.py")
+        client = MCPAzureOpenAIClient()
+
+        # Connect in the background while the banner is printed
+        connected = loop_thread.submit(client.connect_to_server("main.py"))
 
         print("\n" + "="*60)
         print("🤖 Azure OpenAI + MCP Interactive Client")
         print("Type your questions or requests. Type 'exit' to quit.")
         print("="*60)
 
+        connected.result()
+
         while True:
             try:
+                # Prepare for the next query while waiting for input
+                if warming is None or warming.done():
+                    warming = loop_thread.submit(client.warm_up())
+
                 # Get user input
                 user_input = input("\n💬 You: ").strip()
                 
@@ -223,11 +839,29 @@ async def interactive_azure_openai():
                 
                 print(f"🔄 Processing: {user_input}")
                 
-                # Process the query
-                response = await client.process_query(user_input)
-                print(f"\n🤖 Assistant: {response}")
+                # Process the query, printing the response as it streams in
+                started = False
+
+                def print_token(token: str):
+                    nonlocal started
+                    if not started:
+                        print("\n🤖 Assistant: ", end="")
+                        started = True
+                    print(token, end="", flush=True)
+
+                query = loop_thread.submit(
+                    client.process_query(user_input, on_token=print_token)
+                )
+                response = query.result()
+                if started:
+                    print()
+                else:
+                    print(f"\n🤖 Assistant: {response}")
                 
             except KeyboardInterrupt:
+                # Stop any query still streaming before the session is torn down
+                if query is not None:
+                    query.cancel()
                 print("\n👋 Goodbye!")
                 break
             except Exception as e:
@@ -239,13 +873,18 @@ async def interactive_azure_openai():
     except Exception as e:
         print(f"❌ Error: {e}")
     finally:
-        await client.cleanup()
+        if warming is not None:
+            warming.cancel()
+        if client is not None:
+            loop_thread.submit(client.cleanup()).result()
+        loop_thread.submit(close_shared_clients()).result()
+        loop_thread.stop()
 
 
-async def main():
+def main():
     """Main entry point for Azure OpenAI integration."""
-    await interactive_azure_openai()
+    interactive_azure_openai()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
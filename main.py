@@ -1,16 +1,25 @@
 # server.py
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
+import asyncio
+import inspect
+import mmap
+import orjson
 import os
 from datetime import datetime
+from typing import Annotated, Any, Callable, Final
+
+from pydantic import Field
+
+try:
+    import uvloop
+except ImportError:  # uvloop does not support Windows
+    uvloop = None
 
 # Create an MCP server
 mcp = FastMCP("Demo")
 
-# Add ASCII rabbit drawing tool
-@mcp.tool()
-def draw_ascii_rabbit() -> str:
-    """Draw a cute ASCII rabbit"""
-    rabbit = """
+# ASCII art returned by draw_ascii_rabbit; built once at import
+_RABBIT_ART: Final[str] = """
        /|   /|  
       ( :v:  )
        |(_)|
@@ -19,7 +28,7 @@ def draw_ascii_rabbit() -> str:
     /         \\
    (___________)
         
-    (\   /)
+    (\\   /)
    ( ._. )
   o_(")(")
   
@@ -31,7 +40,12 @@ def draw_ascii_rabbit() -> str:
      (  v  )
     ^^  o  ^^
     """
-    return rabbit
+
+# Add ASCII rabbit drawing tool
+@mcp.tool()
+def draw_ascii_rabbit() -> str:
+    """Draw a cute ASCII rabbit"""
+    return _RABBIT_ART
 
 # Add a dynamic greeting resource
 @mcp.resource("greeting://{name}")
@@ -39,18 +53,72 @@ def get_greeting(name: str) -> str:
     """Get a personalized greeting"""
     return f"Hello, {name}!"
 
+_DINO_JOKE: Final[str] = "Why don't dinosaurs ever pay their bills? Because they're dead broke! 🦕"
+
 # Add a bad joke resource from Dino
 @mcp.resource("joke://dino")
 def get_dino_joke() -> str:
     """Get a bad joke from Dino"""
-    return "Why don't dinosaurs ever pay their bills? Because they're dead broke! 🦕"
+    return _DINO_JOKE
 
 NOTES_FILE = os.path.join(os.path.dirname(__file__), "notes.txt")
 
-def ensure_file():
-    if not os.path.exists(NOTES_FILE):
-        with open(NOTES_FILE, "w") as f:
-            f.write("")
+# Append-only descriptor kept open for the life of the server; creates the file if needed
+_APPEND_FD = os.open(NOTES_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+# In-memory copy of the notes file, keyed by its modification time and size.
+# Replaced as a whole on every refresh, so a snapshot is never seen half-updated
+_CACHE = {"mtime": None, "size": None, "data": "", "lines": []}
+
+# Number of most recent notes returned inline by read_notes
+READ_NOTES_TAIL = 20
+
+def read_notes_file() -> str:
+    """
+    Return the stripped contents of the sticky note file.
+
+    The file is only re-read when its modification time or size has changed.
+
+    Returns:
+        str: The notes file contents with surrounding whitespace removed.
+    """
+    return refresh_cache()["data"]
+
+def read_note_lines() -> list[str]:
+    """
+    Return the notes in the sticky note file, one entry per line.
+
+    Returns:
+        list[str]: The notes, oldest first.
+    """
+    return refresh_cache()["lines"]
+
+def refresh_cache() -> dict:
+    """
+    Re-read the sticky note file if its modification time or size has changed.
+
+    Returns:
+        dict: A snapshot of the file with its "mtime", "size" in bytes, stripped
+              "data" and "lines". All values describe the same version of the file.
+    """
+    global _CACHE
+    snapshot = _CACHE
+    st = os.fstat(_APPEND_FD)
+    if st.st_mtime_ns == snapshot["mtime"] and st.st_size == snapshot["size"]:
+        return snapshot
+
+    if st.st_size == 0:
+        # Nothing to read, so skip opening the file
+        data = ""
+    else:
+        # Read only the bytes counted in st_size, so notes appended meanwhile
+        # are left for the next refresh
+        with open(NOTES_FILE, "rb") as f:
+            data = f.read(st.st_size).decode("utf-8").strip()
+    lines = data.split("\n") if data else []
+    snapshot = {"mtime": st.st_mtime_ns, "size": st.st_size, "data": data, "lines": lines}
+    _CACHE = snapshot
+    return snapshot
 
 @mcp.tool()
 def add_note(message: str) -> str:
@@ -63,24 +131,136 @@ def add_note(message: str) -> str:
     Returns:
         str: Confirmation message indicating the note was saved.
     """
-    ensure_file()
-    with open(NOTES_FILE, "a") as f:
-        f.write(message + "\n")
+    os.write(_APPEND_FD, (message + "\n").encode("utf-8"))
     return "Note saved!"
 
 @mcp.tool()
 def read_notes() -> str:
     """
-    Read and return all notes from the sticky note file.
+    Summarize the sticky note file and return the most recent notes.
+
+    Use read_notes_range to fetch older notes.
+
+    Returns:
+        str: A JSON object with the number of notes ("n_notes"), the file size
+             ("bytes"), the most recent notes ("tail") and the URI of the full
+             notes resource ("resource"). If no notes exist, a default message
+             is returned.
+    """
+    snapshot = refresh_cache()
+    lines = snapshot["lines"]
+    if not lines:
+        return "No notes yet."
+
+    return orjson.dumps({
+        "n_notes": len(lines),
+        "bytes": snapshot["size"],
+        "tail": lines[-READ_NOTES_TAIL:],
+        "resource": "notes://all",
+    }).decode()
+
+@mcp.resource("notes://range/{start}/{end}")
+@mcp.tool()
+def read_notes_range(start: int, end: int) -> str:
+    """
+    Read a range of notes from the sticky note file.
+
+    Args:
+        start (int): Index of the first note to return, starting from 0.
+        end (int): Index one past the last note to return.
+
+    Returns:
+        str: The selected notes separated by line breaks.
+             If no notes fall in the range, a default message is returned.
+    """
+    return "\n".join(read_note_lines()[start:end]) or "No notes in this range."
+
+def make_dispatcher(tool) -> Callable[[dict, Context], Any]:
+    """
+    Build a function that validates arguments for a registered tool and calls it.
+
+    Arguments are checked with the pydantic model FastMCP compiled for the tool
+    at decoration time, and tools that take a Context receive the batch's
+    context, so batched calls behave like direct calls.
+
+    Args:
+        tool: A tool registered with the FastMCP server.
+
+    Returns:
+        Callable[[dict, Context], Any]: Takes the tool arguments and the request
+            context and returns the tool result.
+    """
+    fn = tool.fn
+    context_kwarg = tool.context_kwarg
+    pre_parse_json = tool.fn_metadata.pre_parse_json
+    validate = tool.fn_metadata.arg_model.model_validate
+
+    def dispatch(arguments: dict, ctx: Context) -> Any:
+        kwargs = validate(pre_parse_json(arguments)).model_dump_one_level()
+        if context_kwarg is not None:
+            kwargs[context_kwarg] = ctx
+        return fn(**kwargs)
+
+    return dispatch
+
+# Tool name -> dispatcher for the tools batch_execute can run; filled in at the
+# end of the module, once every tool has been registered
+BATCH_DISPATCH: dict[str, Callable[[dict, Context], Any]] = {}
+
+@mcp.tool()
+async def batch_execute(
+    calls: list[dict],
+    max_concurrent: Annotated[int, Field(ge=1)] = 8,
+    stop_on_error: bool = False,
+    *,
+    ctx: Context,
+) -> str:
+    """
+    Run several tool calls concurrently in a single request.
+
+    Args:
+        calls (list[dict]): Tool calls, each as {"name": ..., "arguments": {...}}.
+        max_concurrent (int): Maximum number of calls to run at once; at least 1.
+        stop_on_error (bool): Skip calls that have not started yet once a call fails.
+        ctx (Context): The request context, passed on to tools that take one.
+
+    Returns:
+        str: A JSON list with one {"name", "content", "isError"} entry per call,
+             in the same order as the calls.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    failed = asyncio.Event()
+
+    async def run(call: dict) -> dict:
+        name = call.get("name")
+        async with semaphore:
+            if stop_on_error and failed.is_set():
+                return {"name": name, "content": "Skipped after an earlier error", "isError": True}
+            try:
+                dispatch = BATCH_DISPATCH.get(name)
+                if dispatch is None:
+                    raise ValueError(f"Unknown tool: {name}")
+                content = await asyncio.to_thread(dispatch, call.get("arguments", {}), ctx)
+                if inspect.isawaitable(content):
+                    content = await content
+                return {"name": name, "content": content, "isError": False}
+            except Exception as e:
+                failed.set()
+                return {"name": name, "content": f"Error executing tool {name}: {e}", "isError": True}
+
+    results = await asyncio.gather(*(run(call) for call in calls))
+    return orjson.dumps(results).decode()
+
+@mcp.resource("notes://all")
+def get_all_notes() -> str:
+    """
+    Get every note from the sticky note file.
 
     Returns:
         str: All notes as a single string separated by line breaks.
              If no notes exist, a default message is returned.
     """
-    ensure_file()
-    with open(NOTES_FILE, "r") as f:
-        content = f.read().strip()
-    return content or "No notes yet."
+    return read_notes_file() or "No notes yet."
 
 @mcp.resource("notes://latest")
 def get_latest_note() -> str:
@@ -90,10 +270,18 @@ def get_latest_note() -> str:
     Returns:
         str: The last note entry. If no notes exist, a default message is returned.
     """
-    ensure_file()
-    with open(NOTES_FILE, "r") as f:
-        lines = f.readlines()
-    return lines[-1].strip() if lines else "No notes yet."
+    # Checking the size first also avoids mapping an empty file, which mmap rejects
+    if os.fstat(_APPEND_FD).st_size == 0:
+        return "No notes yet."
+
+    with open(NOTES_FILE, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Skip trailing newlines, then search backwards for the start of the last line
+            end = len(mm)
+            while end and mm[end - 1] == ord("\n"):
+                end -= 1
+            start = mm.rfind(b"\n", 0, end) + 1
+            return mm[start:end].decode("utf-8").strip()
 
 @mcp.prompt()
 def note_summary_prompt() -> str:
@@ -104,14 +292,23 @@ def note_summary_prompt() -> str:
         str: A prompt string that includes all notes and asks for a summary.
              If no notes exist, a message will be shown indicating that.
     """
-    ensure_file()
-    with open(NOTES_FILE, "r") as f:
-        content = f.read().strip()
+    content = read_notes_file()
     if not content:
         return "There are no notes yet."
 
     return f"Summarize the current notes: {content}"
 
+# Every tool except batch_execute itself can be batched
+BATCH_DISPATCH.update(
+    (tool.name, make_dispatcher(tool))
+    for tool in mcp._tool_manager.list_tools()
+    if tool.name != "batch_execute"
+)
+
 if __name__ == "__main__":
+    # Prefer uvloop's libuv-based loop when it is installed
+    if uvloop:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
     # Run the FastMCP server
     mcp.run(transport="stdio")
\ No newline at end of file